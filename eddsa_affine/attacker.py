@@ -6,11 +6,25 @@ This module implements the attack described in the paper to recover EdDSA privat
 when nonces have an affine relationship: r2 = alpha*r1 + beta.
 """
 
-import hashlib
-from typing import Tuple, Optional
+from collections import Counter
+# hashlib.sha512 is already OpenSSL's EVP constructor, which picks hardware
+# SHA-512 instructions at runtime, so no separate native backend is added.
+# The attack only recomputes public challenges: calls pass usedforsecurity=False.
+from hashlib import sha512 as _sha512
+from typing import Callable, Dict, List, Sequence, Tuple, Optional
+
+try:
+    # GMP-backed integers: 256-bit mul/mod/inverse run in hand-tuned assembly
+    from gmpy2 import mpz, invert
+except ImportError:  # gmpy2 is optional; fall back to CPython ints
+    mpz = int
+
+    def invert(x: int, m: int) -> int:
+        return pow(x, -1, m)
 
 # Ed25519 curve order
 CURVE_ORDER = 2**252 + 27742317777372353535851937790883648493
+_Q = mpz(CURVE_ORDER)
 
 
 def compute_h(r: int, public_key: bytes, message: bytes) -> int:
@@ -32,12 +46,48 @@ def compute_h(r: int, public_key: bytes, message: bytes) -> int:
     data = r_bytes + public_key + message
     
     # Hash with SHA-512
-    h = hashlib.sha512(data).digest()
+    h = _sha512(data, usedforsecurity=False).digest()
     
     # Convert to integer (little-endian) and reduce mod curve order
     return int.from_bytes(h, 'little') % CURVE_ORDER
 
 
+def compute_h_batch(
+    rs: Sequence[int],
+    public_key: bytes,
+    messages: Sequence[bytes]
+) -> List[int]:
+    """
+    Compute H(R||A||M) for many signatures sharing one public key.
+    
+    Equivalent to calling compute_h for each (r, message) pair, but keeps the
+    hash constructor and reduction in a single tight loop so drivers that
+    attack many signatures don't pay per-call Python overhead.
+    
+    Args:
+        rs: R points as integers
+        public_key: Public key A (32 bytes)
+        messages: Message bytes, one per R
+        
+    Returns:
+        List of integer hash values mod curve order
+    """
+    if len(rs) != len(messages):
+        raise ValueError("rs and messages must have the same length")
+    
+    from_bytes = int.from_bytes
+    q = CURVE_ORDER
+    hs = []
+    for r, message in zip(rs, messages):
+        # Stream R || A || M into one hash object instead of concatenating
+        # them into a fresh bytes object per signature
+        h = _sha512(r.to_bytes(32, 'little'), usedforsecurity=False)
+        h.update(public_key)
+        h.update(message)
+        hs.append(from_bytes(h.digest(), 'little') % q)
+    return hs
+
+
 def attack(
     sig1: Tuple[int, int, bytes, bytes],  # (r1, s1, public_key, message1)
     sig2: Tuple[int, int, bytes, bytes],  # (r2, s2, public_key, message2)
@@ -76,25 +126,184 @@ def attack(
     Returns:
         Private key if recovery successful, None if denominator is zero
     """
-    r1, s1, public_key1, message1 = sig1
-    r2, s2, public_key2, message2 = sig2
+    return make_attacker(alpha, beta)(sig1, sig2)
+
+
+def make_attacker(
+    alpha: int,
+    beta: int
+) -> Callable[[Tuple[int, int, bytes, bytes], Tuple[int, int, bytes, bytes]], Optional[int]]:
+    """
+    Specialize attack() to one fixed affine relationship.
+    
+    alpha and beta are lifted to mpz and the alpha == 1 / alpha == 0 branch is
+    chosen once, so drivers that attack many pairs under the same (alpha, beta),
+    such as a fixture file generated with a known relationship, only pay for
+    the hashes and the modular solve on each call.
+    
+    Args:
+        alpha: Affine coefficient (r2 = alpha*r1 + beta)
+        beta: Affine offset (r2 = alpha*r1 + beta)
+    
+    Returns:
+        Function taking (sig1, sig2) and returning the private key, or None if
+        the denominator is zero
+    """
+    terms = _affine_terms_for(mpz(alpha), mpz(beta))
+    
+    def attacker(
+        sig1: Tuple[int, int, bytes, bytes],
+        sig2: Tuple[int, int, bytes, bytes]
+    ) -> Optional[int]:
+        r1, s1, public_key1, message1 = sig1
+        r2, s2, public_key2, message2 = sig2
+        
+        # Ensure both signatures use the same public key
+        if public_key1 != public_key2:
+            raise ValueError("Signatures must use the same public key")
+        
+        public_key = public_key1
+        
+        # Compute H(R||A||M) for both signatures
+        h1 = compute_h(r1, public_key, message1)
+        h2 = compute_h(r2, public_key, message2)
+        
+        return _divide(*terms(mpz(s1), mpz(s2), mpz(h1), mpz(h2)))
+    
+    return attacker
+
+
+def attack_batch(
+    sigs: Sequence[Tuple[int, int, bytes, bytes]],
+    alpha: int,
+    beta: int
+) -> Dict[Tuple[int, int], int]:
+    """
+    Run the affine nonce attack on every signature pair (i, j) with i < j.
+    
+    Every pair is solved as if r_j = alpha*r_i + beta. For a nonce sequence
+    r_{i+1} = alpha*r_i + beta that only holds for adjacent pairs (and for
+    every pair when alpha == 1, beta == 0); other pairs yield scattered keys,
+    which most_common_key outvotes.
+    
+    Each H(R||A||M) is computed once up front instead of once per pair, so a
+    set of N signatures costs N hashes rather than N*(N-1). All pair
+    denominators are then inverted together with a single modular inverse.
+    
+    Args:
+        sigs: Signature tuples (r, s, public_key, message), one public key for all
+        alpha: Affine coefficient (r_j = alpha*r_i + beta)
+        beta: Affine offset (r_j = alpha*r_i + beta)
+    
+    Returns:
+        Mapping of (i, j) to the candidate private key for every pair whose
+        denominator is non-zero
+    """
+    if not sigs:
+        return {}
     
-    # Ensure both signatures use the same public key
-    if public_key1 != public_key2:
+    public_key = sigs[0][2]
+    if any(sig[2] != public_key for sig in sigs):
         raise ValueError("Signatures must use the same public key")
     
-    public_key = public_key1
-    q = CURVE_ORDER
+    hs = [mpz(h) for h in compute_h_batch(
+        [sig[0] for sig in sigs], public_key, [sig[3] for sig in sigs]
+    )]
+    ss = [mpz(sig[1]) for sig in sigs]
+    terms = _affine_terms_for(mpz(alpha), mpz(beta))
+    
+    pairs = []
+    numerators = []
+    denominators = []
+    for i in range(len(sigs)):
+        for j in range(i + 1, len(sigs)):
+            numerator, denominator = terms(ss[i], ss[j], hs[i], hs[j])
+            # Zero denominators have no inverse and would zero the whole batch
+            if denominator != 0:
+                pairs.append((i, j))
+                numerators.append(numerator)
+                denominators.append(denominator)
+    
+    q = _Q
+    inverses = _batch_inverse(denominators, q)
+    return {
+        pair: int((numerator * inverse) % q)
+        for pair, numerator, inverse in zip(pairs, numerators, inverses)
+    }
+
+
+def most_common_key(candidates: Dict[Tuple[int, int], int]) -> Optional[int]:
+    """
+    Pick the private key recovered by the most signature pairs.
+    
+    Pairs whose nonces really follow the assumed relationship all agree on the
+    true key, while unrelated pairs yield scattered values.
+    
+    Args:
+        candidates: Result of attack_batch
     
-    # Compute H(R||A||M) for both signatures
-    h1 = compute_h(r1, public_key, message1)
-    h2 = compute_h(r2, public_key, message2)
+    Returns:
+        The majority candidate, or None if there are no candidates
+    """
+    if not candidates:
+        return None
+    return Counter(candidates.values()).most_common(1)[0][0]
+
+
+def _batch_inverse(values: List[int], modulus: int) -> List[int]:
+    """
+    Return the inverse of every non-zero value mod `modulus`.
+    
+    The prefix products are inverted with one invert() call and each inverse
+    is recovered on the way back, so N values cost a single inversion plus
+    about 3N multiplications.
+    """
+    if not values:
+        return []
+    
+    prefix = []
+    acc = mpz(1)
+    for v in values:
+        acc = (acc * v) % modulus
+        prefix.append(acc)
     
-    # Calculate numerator: (s2 - alpha * s1 - beta) mod q
-    numerator = (s2 - alpha * s1 - beta) % q
+    inv = invert(acc, modulus)
+    inverses = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        inverses[i] = (inv * prefix[i - 1]) % modulus
+        inv = (inv * values[i]) % modulus
+    inverses[0] = inv
+    return inverses
+
+
+def _affine_terms_for(alpha: int, beta: int) -> Callable[[int, int, int, int], Tuple[int, int]]:
+    """
+    Return f(s1, s2, h1, h2) -> ((s2 - alpha*s1 - beta) mod q, (h2 - alpha*h1) mod q).
+    
+    The branch on alpha is taken here, once per relationship rather than once
+    per pair. alpha, beta and the operands of f are expected to be mpz already.
+    """
+    q = _Q
     
-    # Calculate denominator: (h2 - alpha * h1) mod q
-    denominator = (h2 - alpha * h1) % q
+    if alpha == 1:
+        # Same nonce / counter / fixed step: r2 = r1 + beta, no alpha products
+        def terms(s1, s2, h1, h2):
+            return (s2 - s1 - beta) % q, (h2 - h1) % q
+    elif alpha == 0:
+        # Degenerate r2 = beta: the second nonce is known outright
+        def terms(s1, s2, h1, h2):
+            return (s2 - beta) % q, h2 % q
+    else:
+        def terms(s1, s2, h1, h2):
+            # (s2 - alpha * s1 - beta) mod q, (h2 - alpha * h1) mod q
+            return (s2 - alpha * s1 - beta) % q, (h2 - alpha * h1) % q
+    
+    return terms
+
+
+def _divide(numerator: int, denominator: int) -> Optional[int]:
+    """Return numerator / denominator mod q, or None if the denominator is zero."""
+    q = _Q
     
     # Check if denominator is zero (division by zero)
     # This check prevents modular inverse error
@@ -103,13 +312,12 @@ def attack(
     
     # Calculate modular inverse of denominator
     try:
-        denominator_inv = pow(denominator, -1, q)
-    except ValueError:
+        denominator_inv = invert(denominator, q)
+    except (ValueError, ZeroDivisionError):
         # This shouldn't happen if denominator != 0, but handle it anyway
         return None
     
     # Recover private key: a = (numerator * denominator_inv) mod q
     private_key = (numerator * denominator_inv) % q
     
-    return private_key
-
+    return int(private_key)
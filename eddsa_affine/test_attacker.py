@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the EdDSA affine nonce attack.
+
+Run from the repository root: python3 -m unittest eddsa_affine.test_attacker
+"""
+
+import random
+import unittest
+
+from eddsa_affine.attacker import (
+    CURVE_ORDER,
+    _batch_inverse,
+    attack,
+    attack_batch,
+    make_attacker,
+    compute_h,
+    compute_h_batch,
+    most_common_key,
+)
+
+try:
+    from scripts.flawed_eddsa_signer import FlawedEdDSASigner
+except ImportError:  # PyNaCl is not installed
+    FlawedEdDSASigner = None
+
+
+class BatchInverseTest(unittest.TestCase):
+    def test_matches_pow(self):
+        rng = random.Random(1)
+        values = [rng.randrange(1, CURVE_ORDER) for _ in range(50)] + [1, CURVE_ORDER - 1]
+        
+        inverses = _batch_inverse(values, CURVE_ORDER)
+        
+        self.assertEqual(
+            [int(inv) for inv in inverses],
+            [pow(v, -1, CURVE_ORDER) for v in values]
+        )
+    
+    def test_empty(self):
+        self.assertEqual(_batch_inverse([], CURVE_ORDER), [])
+
+
+class ComputeHBatchTest(unittest.TestCase):
+    def test_matches_compute_h(self):
+        rng = random.Random(2)
+        public_key = bytes(range(32))
+        rs = [rng.randrange(2**256) for _ in range(8)]
+        messages = [f"Test message {i}".encode() for i in range(8)]
+        
+        self.assertEqual(
+            compute_h_batch(rs, public_key, messages),
+            [compute_h(r, public_key, m) for r, m in zip(rs, messages)]
+        )
+    
+    def test_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            compute_h_batch([1, 2], bytes(32), [b"only one"])
+
+
+@unittest.skipIf(FlawedEdDSASigner is None, "PyNaCl is not installed")
+class AttackBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.signer = FlawedEdDSASigner(bytes(range(32)))
+        self.messages = [f"Test message {i}".encode() for i in range(5)]
+    
+    @staticmethod
+    def _tuples(signatures):
+        return [(sig['r'], sig['s'], sig['public_key'], sig['message']) for sig in signatures]
+    
+    def test_recovers_key_from_affine_batch(self):
+        sigs = self._tuples(self.signer.sign_with_affine_nonces(self.messages, a=2, b=1))
+        
+        candidates = attack_batch(sigs, 2, 1)
+        
+        # Only adjacent signatures satisfy r_j = 2*r_i + 1
+        for i in range(len(sigs) - 1):
+            self.assertEqual(candidates[(i, i + 1)], self.signer._a_scalar)
+        self.assertEqual(most_common_key(candidates), self.signer._a_scalar)
+    
+    def test_recovers_key_from_every_same_nonce_pair(self):
+        sigs = self._tuples(self.signer.sign_with_same_nonce(self.messages))
+        
+        candidates = attack_batch(sigs, 1, 0)
+        
+        self.assertEqual(len(candidates), len(sigs) * (len(sigs) - 1) // 2)
+        self.assertEqual(set(candidates.values()), {self.signer._a_scalar})
+    
+    def test_matches_pairwise_attack(self):
+        sigs = self._tuples(self.signer.sign_with_affine_nonces(self.messages, a=3, b=5))
+        
+        for (i, j), key in attack_batch(sigs, 3, 5).items():
+            self.assertEqual(key, attack(sigs[i], sigs[j], 3, 5))
+    
+    def test_rejects_mixed_public_keys(self):
+        sigs = self._tuples(self.signer.sign_with_same_nonce(self.messages))
+        other = FlawedEdDSASigner(bytes(32))
+        sigs += self._tuples(other.sign_with_same_nonce(self.messages[:1]))
+        
+        with self.assertRaises(ValueError):
+            attack_batch(sigs, 1, 0)
+    
+    def test_empty(self):
+        self.assertEqual(attack_batch([], 2, 1), {})
+        self.assertIsNone(most_common_key({}))
+
+
+
+@unittest.skipIf(FlawedEdDSASigner is None, "PyNaCl is not installed")
+class MakeAttackerTest(unittest.TestCase):
+    def test_matches_attack(self):
+        signer = FlawedEdDSASigner(bytes(range(32)))
+        messages = [f"Test message {i}".encode() for i in range(4)]
+        
+        for alpha, beta in [(1, 0), (0, 7), (2, 1), (3, 5)]:
+            signatures = signer.sign_with_affine_nonces(messages, a=alpha, b=beta)
+            sigs = [(sig['r'], sig['s'], sig['public_key'], sig['message']) for sig in signatures]
+            attacker = make_attacker(alpha, beta)
+            
+            self.assertEqual(attacker(sigs[0], sigs[1]), signer._a_scalar)
+            self.assertEqual(attacker(sigs[0], sigs[2]), attack(sigs[0], sigs[2], alpha, beta))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Helpers shared by the ECDSA and EdDSA fixture scripts.
+
+Kept free of curve libraries so either signer can import it without pulling
+in the other's dependencies.
+"""
+
+import json
+import os
+from typing import Callable, Iterable, List
+
+
+def _encode_indented(record: dict) -> str:
+    return json.dumps(record, indent=2)
+
+
+def dump_records(
+    records: Iterable[dict],
+    f,
+    encode: Callable[[dict], str] = _encode_indented
+):
+    """
+    Stream records to `f` as an indented JSON array, one record at a time.
+    
+    Produces the same text as json.dump(list(records), f, indent=2) without
+    building the list of records first.
+    
+    Args:
+        records: Records to write, e.g. a generator
+        f: Text file to write to
+        encode: Encodes one record as 2-space-indented JSON text
+    """
+    separator = '\n  '
+    f.write('[')
+    for record in records:
+        f.write(separator)
+        f.write(encode(record).replace('\n', '\n  '))
+        separator = ',\n  '
+    # An empty array is written as "[]", like json.dump
+    f.write(']' if separator == '\n  ' else '\n]')
+
+
+def rand_scalar(modulus: int) -> int:
+    """Draw a uniform scalar mod `modulus` from one 64-byte urandom read (bias < 2^-256)."""
+    return int.from_bytes(os.urandom(64), 'big') % modulus
+
+
+def batch_inverse(values: List[int], modulus: int) -> List[int]:
+    """
+    Invert every value mod `modulus` with a single modular inverse.
+    
+    Uses Montgomery's trick: invert the running product once, then walk back
+    through the prefix products to peel off each individual inverse.
+    """
+    if not values:
+        return []
+    
+    prefix = []
+    acc = 1
+    for v in values:
+        acc = (acc * v) % modulus
+        prefix.append(acc)
+    
+    inv = pow(acc, -1, modulus)
+    inverses = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        inverses[i] = (inv * prefix[i - 1]) % modulus
+        inv = (inv * values[i]) % modulus
+    inverses[0] = inv
+    return inverses
@@ -17,20 +17,56 @@ CRITICAL RULES for flawed nonce generation:
 4. Do NOT re-encode, re-clamp, or adjust r
 """
 
-import hashlib
 import json
 import os
-import secrets
-from typing import List, Tuple, Optional
+from hashlib import sha512 as _sha512
+from typing import Iterable, List, Tuple, Optional
 from nacl.signing import SigningKey, VerifyKey
 from nacl.encoding import RawEncoder, HexEncoder
 import nacl.bindings
 
+try:
+    from .fixture_utils import dump_records, rand_scalar
+except ImportError:  # run as a script, with scripts/ on sys.path
+    from fixture_utils import dump_records, rand_scalar
+
 
 # Ed25519 curve order
 CURVE_ORDER = 2**252 + 27742317777372353535851937790883648493
 
 
+# One fixture entry, laid out exactly as json.dumps(..., indent=2) would.
+# r and s are fixed-width 32-byte scalars, always written as 0x-prefixed
+# 64-digit hex; message and public_key are written as plain hex.
+_SIGNATURE_TEMPLATE = (
+    '{\n'
+    '  "message": "%s",\n'
+    '  "r": "0x%064x",\n'
+    '  "s": "0x%064x",\n'
+    '  "public_key": "%s"\n'
+    '}'
+)
+
+
+def format_signature(sig: dict) -> str:
+    """
+    Encode one signature as a 2-space-indented JSON object.
+    
+    Signers keep r, s, message and public_key as raw ints/bytes; they are
+    formatted straight into the output text here, without building an
+    intermediate dict. This matches the format the eddsaaffine package parses.
+    """
+    return _SIGNATURE_TEMPLATE % (
+        sig['message'].hex(), sig['r'], sig['s'], sig['public_key'].hex()
+    )
+
+
+def write_signatures(path: str, signatures: Iterable[dict]):
+    """Write signatures to `path` as an indented JSON fixture, one signature at a time."""
+    with open(path, 'w') as f:
+        dump_records(signatures, f, format_signature)
+
+
 class FlawedEdDSASigner:
     """
     A flawed EdDSA signer that uses random nonces (non-standard) with reuse or affine relationships.
@@ -60,10 +96,19 @@ class FlawedEdDSASigner:
         
         self.vk = self.sk.verify_key
         self.public_key = self.vk.encode(encoder=RawEncoder)
+        
+        # Derive private key scalar once (Ed25519 standard: SHA-512 then clamp)
+        h_priv = _sha512(self.private_key).digest()
+        a_bytes = bytearray(h_priv[:32])
+        # Clamp the private key scalar (Ed25519 requirement for private key only)
+        a_bytes[0] &= 0xf8  # Clear bottom 3 bits
+        a_bytes[31] &= 0x7f  # Clear top bit
+        a_bytes[31] |= 0x40  # Set second-highest bit
+        self._a_scalar = int.from_bytes(bytes(a_bytes), 'little') % CURVE_ORDER
     
     def hash_message(self, message: bytes) -> bytes:
         """Hash a message using SHA-512 (EdDSA standard)."""
-        return hashlib.sha512(message).digest()
+        return _sha512(message).digest()
     
     def compute_h(self, r: bytes, public_key: bytes, message: bytes) -> int:
         """
@@ -78,10 +123,34 @@ class FlawedEdDSASigner:
             Integer hash value mod curve order
         """
         data = r + public_key + message
-        h = hashlib.sha512(data).digest()
+        h = _sha512(data).digest()
         # Reduce mod curve order
         return int.from_bytes(h, 'little') % CURVE_ORDER
     
+    def compute_h_batch(self, rs: List[bytes], public_key: bytes, messages: List[bytes]) -> List[int]:
+        """
+        Compute H(R||A||M) for a batch of (R, M) pairs under one public key.
+        
+        Args:
+            rs: R points (32 bytes each)
+            public_key: Public key A (32 bytes)
+            messages: Message bytes, one per R
+            
+        Returns:
+            List of integer hash values mod curve order
+        """
+        if len(rs) != len(messages):
+            raise ValueError("rs and messages must have the same length")
+        
+        from_bytes = int.from_bytes
+        hs = []
+        for r, message in zip(rs, messages):
+            h = _sha512(r)
+            h.update(public_key)
+            h.update(message)
+            hs.append(from_bytes(h.digest(), 'little') % CURVE_ORDER)
+        return hs
+    
     def sign_with_same_nonce(
         self,
         messages: List[bytes],
@@ -97,7 +166,7 @@ class FlawedEdDSASigner:
             nonce: Optional nonce scalar (generates random one if not provided)
         
         Returns:
-            List of signature dictionaries with r, s, message values
+            List of signature dictionaries with r and s as ints, message and public_key as bytes
         """
         # Same nonce reuse: r2 = 1*r1 + 0 (all nonces are the same)
         return self.sign_with_affine_nonces(messages, a=1, b=0, start_nonce=nonce)
@@ -127,65 +196,58 @@ class FlawedEdDSASigner:
             start_nonce: Optional starting nonce (generates random one if not provided)
         
         Returns:
-            List of signature dictionaries with r, s, message values
+            List of signature dictionaries with r and s as ints, message and public_key as bytes
         """
         if start_nonce is None:
-            start_nonce = secrets.randbelow(CURVE_ORDER)
+            start_nonce = rand_scalar(CURVE_ORDER)
         
-        signatures = []
+        a_priv = self._a_scalar
         
         # CRITICAL: Use raw nonce scalars, NO CLAMPING
         # The affine relationship r2 = a*r1 + b must hold on the scalar values
-        current_r = start_nonce % CURVE_ORDER
+        nonces = self._affine_nonce_sequence(start_nonce, a, b, len(messages))
         
-        # Derive private key scalar once (Ed25519 standard: SHA-512 then clamp)
-        h_priv = hashlib.sha512(self.private_key).digest()
-        a_bytes = bytearray(h_priv[:32])
-        # Clamp the private key scalar (Ed25519 requirement for private key only)
-        a_bytes[0] &= 0xf8  # Clear bottom 3 bits
-        a_bytes[31] &= 0x7f  # Clear top bit
-        a_bytes[31] |= 0x40  # Set second-highest bit
-        a_priv = int.from_bytes(bytes(a_bytes), 'little') % CURVE_ORDER
+        # Compute every R = r * B (base point) from the raw scalar bytes
+        # Use noclamp because we're using raw nonce scalars (not clamped)
+        scalarmult_base = nacl.bindings.crypto_scalarmult_ed25519_base_noclamp
+        r_points = [scalarmult_base(r.to_bytes(32, 'little')) for r in nonces]
         
-        for i, message in enumerate(messages):
-            # Use the SAME r scalar for both R and S computation
-            r = current_r
-            
-            # Convert r to 32-byte little-endian for point multiplication
-            # CRITICAL: Do NOT clamp - use raw scalar bytes
-            r_bytes = r.to_bytes(32, 'little')
-            # Pad to 32 bytes if needed
-            if len(r_bytes) < 32:
-                r_bytes = r_bytes + b'\x00' * (32 - len(r_bytes))
-            elif len(r_bytes) > 32:
-                r_bytes = r_bytes[:32]
-            
-            # Compute R = r * B (base point)
-            # Use noclamp because we're using raw nonce scalar (not clamped)
-            R_point = nacl.bindings.crypto_scalarmult_ed25519_base_noclamp(r_bytes)
-            r_bytes_encoded = R_point  # R point as 32-byte compressed format
-            r_int = int.from_bytes(r_bytes_encoded, 'little')
-            
-            # Compute challenge: k = H(R || A || M) mod ℓ
-            k = self.compute_h(r_bytes_encoded, self.public_key, message)
-            
-            # Compute signature scalar: S = (r + k*a) mod ℓ
-            # CRITICAL: Use the SAME r scalar that was used for R computation
-            s = (r + k * a_priv) % CURVE_ORDER
-            
-            signatures.append({
-                'message': message.hex(),
-                'r': hex(r_int),
-                's': hex(s),
-                'public_key': self.public_key.hex(),
-            })
-            
-            # Calculate next nonce: r_{i+1} = (a*r_i + b) % ℓ
-            # CRITICAL: Apply affine relationship on raw scalars (no clamping)
-            if i < len(messages) - 1:
-                current_r = (a * r + b) % CURVE_ORDER
+        # Compute all challenges k = H(R || A || M) mod ℓ in one batch
+        ks = self.compute_h_batch(r_points, self.public_key, messages)
         
-        return signatures
+        # Compute signature scalars: S = (r + k*a) mod ℓ
+        # CRITICAL: Use the SAME r scalar that was used for R computation
+        ss = [(r + k * a_priv) % CURVE_ORDER for r, k in zip(nonces, ks)]
+        
+        # Raw values; format_signature hex-encodes them when the fixture is written
+        public_key = self.public_key
+        return [
+            {
+                'message': message,
+                'r': int.from_bytes(R_point, 'little'),
+                's': s,
+                'public_key': public_key,
+            }
+            for message, R_point, s in zip(messages, r_points, ss)
+        ]
+    
+    @staticmethod
+    def _affine_nonce_sequence(start_nonce: int, a: int, b: int, count: int) -> List[int]:
+        """
+        Expand r_i = (a*r_{i-1} + b) % ℓ into the first `count` nonces.
+        
+        For a == 1 (same nonce, counter and hardcoded step) the sequence is the
+        arithmetic progression r_0 + i*b, generated without the multiply.
+        """
+        r = start_nonce % CURVE_ORDER
+        if a == 1:
+            return [(r + i * b) % CURVE_ORDER for i in range(count)]
+        
+        nonces = []
+        for _ in range(count):
+            nonces.append(r)
+            r = (a * r + b) % CURVE_ORDER
+        return nonces
     
     def sign_with_counter_nonce(
         self,
@@ -202,7 +264,7 @@ class FlawedEdDSASigner:
             start_nonce: Optional starting nonce (generates random one if not provided)
         
         Returns:
-            List of signature dictionaries
+            List of signature dictionaries with r and s as ints, message and public_key as bytes
         """
         # Counter: r_i = r_0 + i = 1*r_0 + i
         # This is affine with a=1, b=i (but b changes per signature)
@@ -226,7 +288,7 @@ class FlawedEdDSASigner:
             start_nonce: Optional starting nonce
         
         Returns:
-            List of signature dictionaries
+            List of signature dictionaries with r and s as ints, message and public_key as bytes
         """
         # Hardcoded step: r_i = r_0 + i*step = 1*r_0 + i*step
         # For each signature pair (i, i+1): r_{i+1} = r_i + step = 1*r_i + step
@@ -249,7 +311,7 @@ class FlawedEdDSASigner:
             messages: List of messages to sign
             
         Returns:
-            List of signature dictionaries with r, s, message, public_key values
+            List of signature dictionaries with r and s as ints, message and public_key as bytes
         """
         signatures = []
         
@@ -269,23 +331,11 @@ class FlawedEdDSASigner:
             r_int = int.from_bytes(r_bytes, 'little')
             s_int = int.from_bytes(s_bytes, 'little')
             
-            # Format as hex strings (big-endian representation of the integer)
-            # Match the format from test_eddsa_signatures_standard.json:
-            # - r: "0x..." (hex string with 0x prefix, padded to 64 hex chars = 32 bytes)
-            # - s: "0x..." (hex string with 0x prefix, padded to 64 hex chars = 32 bytes)
-            # This ensures compatibility with eddsaaffine package
-            r_hex_raw = hex(r_int)[2:]  # Remove 0x prefix
-            s_hex_raw = hex(s_int)[2:]  # Remove 0x prefix
-            
-            # Pad with leading zeros to ensure exactly 64 hex characters (32 bytes)
-            r_hex = "0x" + r_hex_raw.zfill(64)
-            s_hex = "0x" + s_hex_raw.zfill(64)
-            
             signatures.append({
-                'message': message.hex(),
-                'r': r_hex,  # Padded to 64 hex chars
-                's': s_hex,  # Padded to 64 hex chars
-                'public_key': self.public_key.hex(),
+                'message': message,
+                'r': r_int,
+                's': s_int,
+                'public_key': self.public_key,
             })
         
         return signatures
@@ -321,36 +371,31 @@ def main():
     # 1. Same nonce reuse
     print("1. Generating same nonce reuse signatures...")
     same_nonce_sigs = signer.sign_with_same_nonce(messages)
-    with open('fixtures/test_eddsa_signatures_same_nonce.json', 'w') as f:
-        json.dump(same_nonce_sigs, f, indent=2)
+    write_signatures('fixtures/test_eddsa_signatures_same_nonce.json', same_nonce_sigs)
     print(f"   Saved {len(same_nonce_sigs)} signatures to fixtures/test_eddsa_signatures_same_nonce.json")
     
     # 2. Counter nonces (r_i = r_0 + i)
     print("2. Generating counter nonce signatures...")
     counter_sigs = signer.sign_with_counter_nonce(messages)
-    with open('fixtures/test_eddsa_signatures_counter.json', 'w') as f:
-        json.dump(counter_sigs, f, indent=2)
+    write_signatures('fixtures/test_eddsa_signatures_counter.json', counter_sigs)
     print(f"   Saved {len(counter_sigs)} signatures to fixtures/test_eddsa_signatures_counter.json")
     
     # 3. Affine relationship (r2 = 2*r1 + 1)
     print("3. Generating affine relationship signatures (r2 = 2*r1 + 1)...")
     affine_sigs = signer.sign_with_affine_nonces(messages, a=2, b=1)
-    with open('fixtures/test_eddsa_signatures_affine.json', 'w') as f:
-        json.dump(affine_sigs, f, indent=2)
+    write_signatures('fixtures/test_eddsa_signatures_affine.json', affine_sigs)
     print(f"   Saved {len(affine_sigs)} signatures to fixtures/test_eddsa_signatures_affine.json")
     
     # 4. Hardcoded step (r_i = r_0 + i*step)
     print("4. Generating hardcoded step signatures (r_i = r_0 + i*73).")
     step_sigs = signer.sign_with_hardcoded_step(messages, step=13511)
-    with open('fixtures/test_eddsa_signatures_hardcoded_step.json', 'w') as f:
-        json.dump(step_sigs, f, indent=2)
+    write_signatures('fixtures/test_eddsa_signatures_hardcoded_step.json', step_sigs)
     print(f"   Saved {len(step_sigs)} signatures to fixtures/test_eddsa_signatures_hardcoded_step.json")
     
     # 5. Standard Ed25519 (correct signatures for verification testing)
     print("5. Generating standard Ed25519 signatures (deterministic nonces)...")
     standard_sigs = signer.sign_with_standard_ed25519(messages)
-    with open('fixtures/test_eddsa_signatures_standard.json', 'w') as f:
-        json.dump(standard_sigs, f, indent=2)
+    write_signatures('fixtures/test_eddsa_signatures_standard.json', standard_sigs)
     print(f"   Saved {len(standard_sigs)} signatures to fixtures/test_eddsa_signatures_standard.json")
     
     # Verify the standard signatures to ensure they're correct
@@ -359,13 +404,10 @@ def main():
     vk = VerifyKey(signer.public_key)
     verified_count = 0
     for sig in standard_sigs:
-        message_bytes = bytes.fromhex(sig['message'])
-        # Convert R and s from hex strings (big-endian) back to little-endian bytes
-        r_int = int(sig['r'], 16)
-        s_int = int(sig['s'], 16)
-        # Convert to bytes (little-endian, 32 bytes each)
-        r_bytes = r_int.to_bytes(32, 'little')
-        s_bytes = s_int.to_bytes(32, 'little')
+        message_bytes = sig['message']
+        # Convert R and s back to little-endian bytes (32 bytes each)
+        r_bytes = sig['r'].to_bytes(32, 'little')
+        s_bytes = sig['s'].to_bytes(32, 'little')
         full_sig = r_bytes + s_bytes
         try:
             vk.verify(message_bytes, full_sig)
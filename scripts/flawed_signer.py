@@ -20,15 +20,43 @@ CRITICAL RULES for flawed nonce generation:
 import hashlib
 import json
 import os
-import secrets
-from typing import List, Tuple, Optional
+from typing import Dict, Iterator, List, Tuple, Optional
 from ecdsa import SigningKey, SECP256k1, VerifyingKey
 
+try:
+    from .fixture_utils import batch_inverse, dump_records, rand_scalar
+except ImportError:  # run as a script, with scripts/ on sys.path
+    from fixture_utils import batch_inverse, dump_records, rand_scalar
+
+try:
+    # libsecp256k1's fixed-base comb makes k*G several times faster than ecdsa
+    from coincurve import PublicKey as _CoincurvePublicKey
+except ImportError:  # coincurve is optional; fall back to ecdsa's generator
+    _CoincurvePublicKey = None
+
 
 # secp256k1 curve order
 CURVE_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
 
 
+# Signatures are produced column-wise (structure of arrays): parallel lists
+# keyed 'messages', 'z', 'r' and 's', where index i describes signature i
+SignatureBatch = Dict[str, list]
+
+
+def signature_records(signatures: SignatureBatch) -> Iterator[dict]:
+    """
+    Yield a signature batch in the per-signature fixture format.
+    
+    Fixture files keep the [{"message", "z", "r", "s"}, ...] layout that the
+    Go recovery tool parses.
+    """
+    for message, z, r, s in zip(
+        signatures['messages'], signatures['z'], signatures['r'], signatures['s']
+    ):
+        yield {'message': message, 'z': z, 'r': r, 's': s}
+
+
 class FlawedSigner:
     """
     A flawed ECDSA signer that uses random nonces with reuse or affine relationships.
@@ -52,7 +80,9 @@ class FlawedSigner:
             self.private_key = private_key
         else:
             self.sk = SigningKey.generate(curve=SECP256k1)
-            self.private_key = self.sk.privkey.secret_multiplier
+            # ecdsa hands back gmpy2 mpz values when gmpy2 is installed;
+            # keep plain ints so keys and signatures stay JSON-serializable
+            self.private_key = int(self.sk.privkey.secret_multiplier)
         
         self.vk = self.sk.verifying_key
         
@@ -62,6 +92,13 @@ class FlawedSigner:
         prefix = b'\x02' if y % 2 == 0 else b'\x03'
         self.public_key = prefix + x.to_bytes(32, 'big')
     
+    @staticmethod
+    def nonce_point_x(k: int) -> int:
+        """Return the x-coordinate of k*G, using libsecp256k1 when available."""
+        if _CoincurvePublicKey is not None:
+            return _CoincurvePublicKey.from_secret(k.to_bytes(32, 'big')).point()[0]
+        return int((k * SECP256k1.generator).x())
+    
     def hash_message(self, message: bytes) -> int:
         """Hash a message using SHA-256."""
         h = hashlib.sha256(message).digest()
@@ -71,7 +108,7 @@ class FlawedSigner:
         self,
         messages: List[bytes],
         nonce: Optional[int] = None
-    ) -> List[dict]:
+    ) -> SignatureBatch:
         """
         Sign multiple messages using the SAME nonce (nonce reuse attack).
         
@@ -82,7 +119,7 @@ class FlawedSigner:
             nonce: Optional nonce scalar (generates random one if not provided)
         
         Returns:
-            List of signature dictionaries with z, r, s values
+            Signature batch with parallel 'messages', 'z', 'r', 's' lists
         """
         # Same nonce reuse: k2 = 1*k1 + 0 (all nonces are the same)
         return self.sign_with_affine_nonces(messages, a=1, b=0, start_nonce=nonce)
@@ -93,7 +130,7 @@ class FlawedSigner:
         a: int,
         b: int,
         start_nonce: Optional[int] = None
-    ) -> List[dict]:
+    ) -> SignatureBatch:
         """
         Sign messages using affinely related nonces: k_i = a*k_{i-1} + b.
         
@@ -112,54 +149,51 @@ class FlawedSigner:
             start_nonce: Optional starting nonce (generates random one if not provided)
         
         Returns:
-            List of signature dictionaries with z, r, s values
+            Signature batch with parallel 'messages', 'z', 'r', 's' lists
         """
         if start_nonce is None:
-            start_nonce = secrets.randbelow(CURVE_ORDER)
+            start_nonce = rand_scalar(CURVE_ORDER)
         
-        signatures = []
-        curve = SECP256k1
-        G = curve.generator
-        n = curve.order
+        n = CURVE_ORDER
         
         # CRITICAL: Use raw nonce scalars, no modification
         # The affine relationship k2 = a*k1 + b must hold on the scalar values
+        nonces = []
         current_k = start_nonce % n
-        
-        for i, message in enumerate(messages):
-            # Use the SAME k scalar for both r and s computation
-            k = current_k
-            
-            # Compute r = (k * G).x() mod n
-            r = (k * G).x() % n
-            
-            # Hash message
-            z = self.hash_message(message)
-            
-            # Compute s = k^(-1) * (z + r * d) mod n
-            # CRITICAL: Use the SAME k scalar that was used for r computation
-            k_inv = pow(k, -1, n)
-            s = (k_inv * (z + r * self.private_key)) % n
-            
-            signatures.append({
-                'message': message.decode('utf-8') if isinstance(message, bytes) else message,
-                'z': z,
-                'r': r,
-                's': s
-            })
-            
+        for _ in messages:
+            nonces.append(current_k)
             # Calculate next nonce: k_{i+1} = (a*k_i + b) % n
-            # CRITICAL: Apply affine relationship on raw scalars (no modification)
-            if i < len(messages) - 1:
-                current_k = (a * k + b) % n
+            current_k = (a * current_k + b) % n
+        
+        # All nonces are known upfront, so invert them together
+        nonce_invs = batch_inverse(nonces, n)
+        
+        # Compute r = (k * G).x() mod n for every nonce
+        rs = [self.nonce_point_x(k) % n for k in nonces]
         
-        return signatures
+        # Hash messages
+        zs = [self.hash_message(message) for message in messages]
+        
+        # Compute s = k^(-1) * (z + r * d) mod n
+        # CRITICAL: Use the SAME k scalar that was used for r computation
+        d = self.private_key
+        ss = [(k_inv * (z + r * d)) % n for k_inv, z, r in zip(nonce_invs, zs, rs)]
+        
+        return {
+            'messages': [
+                message.decode('utf-8') if isinstance(message, bytes) else message
+                for message in messages
+            ],
+            'z': zs,
+            'r': rs,
+            's': ss,
+        }
     
     def sign_with_counter_nonce(
         self,
         messages: List[bytes],
         start_nonce: Optional[int] = None
-    ) -> List[dict]:
+    ) -> SignatureBatch:
         """
         Sign messages with counter-based nonces: k_i = k_0 + i.
         
@@ -170,7 +204,7 @@ class FlawedSigner:
             start_nonce: Optional starting nonce (generates random one if not provided)
         
         Returns:
-            List of signature dictionaries with z, r, s values
+            Signature batch with parallel 'messages', 'z', 'r', 's' lists
         """
         # Counter: k_i = k_0 + i = 1*k_0 + i
         # This is affine with a=1, b=i (but b changes per signature)
@@ -182,7 +216,7 @@ class FlawedSigner:
         messages: List[bytes],
         step: int,
         start_nonce: Optional[int] = None
-    ) -> List[dict]:
+    ) -> SignatureBatch:
         """
         Sign messages with hardcoded step: k_i = k_0 + i*step.
         
@@ -194,14 +228,14 @@ class FlawedSigner:
             start_nonce: Optional starting nonce
         
         Returns:
-            List of signature dictionaries with z, r, s values
+            Signature batch with parallel 'messages', 'z', 'r', 's' lists
         """
         # Hardcoded step: k_i = k_0 + i*step = 1*k_0 + i*step
         # For each signature pair (i, i+1): k_{i+1} = k_i + step = 1*k_i + step
         # This is affine with a=1, b=step
         return self.sign_with_affine_nonces(messages, a=1, b=step, start_nonce=start_nonce)
     
-    def save_signatures(self, signatures: List[dict], filename: str):
+    def save_signatures(self, signatures: SignatureBatch, filename: str):
         """Save signatures to a JSON file in the fixtures folder."""
         # Ensure fixtures directory exists
         fixtures_dir = os.path.join(os.path.dirname(__file__), "..", "fixtures")
@@ -210,8 +244,8 @@ class FlawedSigner:
         # Save to fixtures folder
         fixtures_path = os.path.join(fixtures_dir, filename)
         with open(fixtures_path, 'w') as f:
-            json.dump(signatures, f, indent=2)
-        print(f"Saved {len(signatures)} signatures to {fixtures_path}")
+            dump_records(signature_records(signatures), f)
+        print(f"Saved {len(signatures['r'])} signatures to {fixtures_path}")
     
     def get_key_info(self) -> dict:
         """Get private and public key information."""
@@ -251,29 +285,29 @@ def main():
     print("1. Generating same nonce reuse signatures...")
     same_nonce_sigs = signer.sign_with_same_nonce(messages)
     with open('fixtures/test_signatures_same_nonce.json', 'w') as f:
-        json.dump(same_nonce_sigs, f, indent=2)
-    print(f"   Saved {len(same_nonce_sigs)} signatures to fixtures/test_signatures_same_nonce.json")
+        dump_records(signature_records(same_nonce_sigs), f)
+    print(f"   Saved {len(same_nonce_sigs['r'])} signatures to fixtures/test_signatures_same_nonce.json")
     
     # 2. Counter nonces (k_i = k_0 + i)
     print("2. Generating counter nonce signatures...")
     counter_sigs = signer.sign_with_counter_nonce(messages)
     with open('fixtures/test_signatures_counter.json', 'w') as f:
-        json.dump(counter_sigs, f, indent=2)
-    print(f"   Saved {len(counter_sigs)} signatures to fixtures/test_signatures_counter.json")
+        dump_records(signature_records(counter_sigs), f)
+    print(f"   Saved {len(counter_sigs['r'])} signatures to fixtures/test_signatures_counter.json")
     
     # 3. Affine relationship (k2 = 2*k1 + 1)
     print("3. Generating affine relationship signatures (k2 = 2*k1 + 1)...")
     affine_sigs = signer.sign_with_affine_nonces(messages, a=2, b=1)
     with open('fixtures/test_signatures_affine.json', 'w') as f:
-        json.dump(affine_sigs, f, indent=2)
-    print(f"   Saved {len(affine_sigs)} signatures to fixtures/test_signatures_affine.json")
+        dump_records(signature_records(affine_sigs), f)
+    print(f"   Saved {len(affine_sigs['r'])} signatures to fixtures/test_signatures_affine.json")
     
     # 4. Hardcoded step (k_i = k_0 + i*step)
     print("4. Generating hardcoded step signatures (k_i = k_0 + i*12345).")
     step_sigs = signer.sign_with_hardcoded_step(messages, step=12345)
     with open('fixtures/test_signatures_hardcoded_step.json', 'w') as f:
-        json.dump(step_sigs, f, indent=2)
-    print(f"   Saved {len(step_sigs)} signatures to fixtures/test_signatures_hardcoded_step.json")
+        dump_records(signature_records(step_sigs), f)
+    print(f"   Saved {len(step_sigs['r'])} signatures to fixtures/test_signatures_hardcoded_step.json")
     
     print("\n✅ All test fixtures generated successfully!")
     print("\nNote: All signatures use RANDOM nonces with affine relationships (non-standard ECDSA) for attack testing.")